@@ -29,16 +29,17 @@ class ControlWebSocketHandler(tornado.websocket.WebSocketHandler):
         logger.info(f"Control WebSocket connected: {self.connection_id}")
 
     def on_close(self):
-        if hasattr(self, 'connection_id') and self.connection_id:
-            self._connections.pop(self.connection_id, None)
-            logger.info(f"Control WebSocket disconnected: {self.connection_id}")
+        connection_id = getattr(self, 'connection_id', None)
+        if connection_id:
+            self._connections.pop(connection_id, None)
+            logger.info(f"Control WebSocket disconnected: {connection_id}")
 
     @classmethod
     def send_command(cls, connection_id, action, payload=None):
         """Send command to specific client by connection_id."""
         conn = cls._connections.get(connection_id)
         if conn:
-            message = json.dumps([action, payload])
+            message = json.dumps([action, payload], ensure_ascii=False, separators=(',', ':'))
             conn.write_message(message)
             return True
         logger.warning(f"Connection not found: {connection_id}")
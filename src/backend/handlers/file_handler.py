@@ -51,7 +51,7 @@ class FileHandler(tornado.web.RequestHandler):
         try:
             if filename is None:
                 files = list_markdown_files(self.docs_dir)
-                self.write(json.dumps(files))
+                self.write(json.dumps(files, ensure_ascii=False, separators=(',', ':')))
                 self.set_header("Content-Type", "application/json")
             else:
                 content = read_file_content(self.docs_dir, filename)
@@ -8,15 +8,24 @@ Commands:
 """
 
 import argparse
+import asyncio
 import functools
+import http.client
 import json
 import logging
+import mimetypes
 import os
+import re
+import socket
+import stat
 import sys
+import tempfile
 import urllib.request
 import urllib.error
 
+import tornado.httpserver
 import tornado.ioloop
+import tornado.netutil
 import tornado.web
 from terminado.management import NamedTermManager, PtyWithClients, MaxTerminalsReached
 from terminado.websocket import TermSocket
@@ -28,6 +37,10 @@ from backend.handlers.control_handler import ControlWebSocketHandler, ControlApi
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SHELL_COMMAND_RE = re.compile(r'^[ \t]*shell_command[ \t]*=(.*)$', re.M)
+
+CONTROL_TIMEOUT = 5  # seconds
+
 
 class SandboxTermManager(NamedTermManager):
     """TermManager that can connect to docker containers or read .tl config files.
@@ -37,10 +50,13 @@ class SandboxTermManager(NamedTermManager):
     - /ws/{config_file}.tl -> read config file and execute shell_command
     """
 
+    DOCKER_ATTACH_ARGV = ('docker', 'exec', '-it')
+
     def __init__(self, shell_command=None, docs_dir=None, connection_id=None):
         super().__init__(shell_command=shell_command)
         self.docs_dir = docs_dir
         self.connection_id = connection_id
+        self._config_cache = {}  # {config_path: ((mtime_ns, size, ino), shell_command)}
 
     def get_terminal(self, term_name: str, connection_id: str = None):
         """Get or create a terminal by name.
@@ -71,34 +87,14 @@ class SandboxTermManager(NamedTermManager):
                 shell_cmd = ['bash']
                 logger.info(f"Terminal will use built-in default shell: bash")
             else:
-                # Read config file to get shell_command
                 config_path = os.path.join(self.docs_dir, config_name)
-                try:
-                    with open(config_path, 'r') as f:
-                        config_content = f.read()
-                    # Parse simple key=value format
-                    shell_command = ''
-                    for line in config_content.split('\n'):
-                        line = line.strip()
-                        if '=' in line and not line.startswith('#'):
-                            key, value = line.split('=', 1)
-                            if key.strip() == 'shell_command':
-                                shell_command = value.strip().strip('"\'"')
-                                break
-
-                    if not shell_command:
-                        shell_command = 'bash'
-
-                    shell_cmd = ['bash', '-c', shell_command]
-                    logger.info(f"Terminal will execute shell_command from {config_name}: {shell_command}")
-                except FileNotFoundError:
-                    raise FileNotFoundError(f"Config file not found: {config_path}")
-                except Exception as e:
-                    raise RuntimeError(f"Error reading config {config_name}: {e}")
+                shell_command = self._read_shell_command(config_path, config_name)
+                shell_cmd = ['bash', '-c', shell_command]
+                logger.info(f"Terminal will execute shell_command from {config_name}: {shell_command}")
         else:
             # Direct container connection
             container_id = config_name
-            shell_cmd = ['bash', '-c', f'docker exec -it {container_id} bash']
+            shell_cmd = [*self.DOCKER_ATTACH_ARGV, container_id, 'bash']
             logger.info(f"Terminal will connect to container: {container_id}")
 
         # Create terminal
@@ -117,15 +113,55 @@ class SandboxTermManager(NamedTermManager):
         self.start_reading(term)
         return term
 
+    def _read_shell_command(self, config_path, config_name):
+        """Read shell_command from a .tl config, reparsing only when the file changes."""
+        try:
+            st = os.stat(config_path)
+            # mtime alone misses quick edits on filesystems with 1-2s timestamps (FAT, SMB)
+            file_key = (st.st_mtime_ns, st.st_size, st.st_ino)
+            cached = self._config_cache.get(config_path)
+            if cached and cached[0] == file_key:
+                return cached[1]
+            with open(config_path, 'r') as f:
+                config_content = f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Config file not found: {config_path}")
+        except Exception as e:
+            raise RuntimeError(f"Error reading config {config_name}: {e}")
+
+        match = SHELL_COMMAND_RE.search(config_content)
+        shell_command = match.group(1).strip().strip('"\'') if match else ''
+        if not shell_command:
+            shell_command = 'bash'
+
+        self._config_cache[config_path] = (file_key, shell_command)
+        return shell_command
+
 
 class TerminalWebSocketHandler(TermSocket):
-    """WebSocket handler with CORS support and error handling."""
+    """WebSocket handler with CORS support and error handling.
+
+    PTY output is coalesced: reads are buffered and sent as one frame once
+    FLUSH_SIZE characters are pending or FLUSH_DELAY seconds have passed.
+    """
+
+    FLUSH_DELAY = 0.003
+    FLUSH_SIZE = 4096
+
+    def initialize(self, term_manager):
+        super().initialize(term_manager)
+        self._pending_output = []
+        self._pending_size = 0
+        self._flush_timeout = None
 
     def check_origin(self, _origin):
         return True
 
     def open(self, url_component=None):
         """Open terminal connection with proper error handling."""
+        # Keystroke echoes are 1-byte frames; the listening socket's TCP_NODELAY
+        # is only inherited on some platforms, so set it per connection too
+        self.set_nodelay(True)
         try:
             # Get connection_id from query parameter
             connection_id = self.get_argument('cid', None)
@@ -146,16 +182,68 @@ class TerminalWebSocketHandler(TermSocket):
         except Exception as e:
             self.close(code=1011, reason=str(e))
 
+    def on_pty_read(self, text):
+        self._pending_output.append(text)
+        self._pending_size += len(text)
+        if self._pending_size >= self.FLUSH_SIZE:
+            self._flush_output()
+        elif self._flush_timeout is None:
+            self._flush_timeout = tornado.ioloop.IOLoop.current().call_later(
+                self.FLUSH_DELAY, self._flush_output
+            )
+
+    def on_pty_died(self):
+        self._flush_output()
+        super().on_pty_died()
+
+    def on_close(self):
+        self._cancel_flush()
+        self._pending_output.clear()
+        super().on_close()
+
+    def _cancel_flush(self):
+        if self._flush_timeout is not None:
+            tornado.ioloop.IOLoop.current().remove_timeout(self._flush_timeout)
+            self._flush_timeout = None
+
+    def _flush_output(self):
+        self._cancel_flush()
+        if not self._pending_output:
+            return
+
+        text = ''.join(self._pending_output)
+        self._pending_output.clear()
+        self._pending_size = 0
+        if self.ws_connection is None or self.ws_connection.is_closing():
+            return
+
+        # Hot path: only the text varies, so skip building and encoding a list per frame;
+        # non-ASCII output stays raw UTF-8 rather than tripling in size as \uXXXX escapes
+        self.write_message('["stdout",' + json.dumps(text, ensure_ascii=False) + ']')
+        if self._enable_output_logging:
+            self.log_terminal_output(f"STDOUT: {text}")
+
 
 class HealthCheckHandler(tornado.web.RequestHandler):
     """Health check endpoint."""
 
+    RESPONSE = json.dumps({'status': 'ok', 'service': 'terminal-ws'}).encode('utf-8')
+
     def get(self):
-        self.write({'status': 'ok', 'service': 'terminal-ws'})
+        self.set_header("Content-Type", "application/json; charset=UTF-8")
+        self.write(self.RESPONSE)
 
 
 class CORSStaticFileHandler(tornado.web.StaticFileHandler):
-    """Static file handler with CORS support."""
+    """Static file handler with CORS support.
+
+    Serves a pre-compressed .br/.gz sibling when the client accepts it, and
+    marks Vite's content-hashed assets/ output as immutable.
+    """
+
+    PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+    content_encoding = None
 
     def set_default_headers(self):
         """Set CORS headers to allow frontend development server access."""
@@ -163,7 +251,59 @@ class CORSStaticFileHandler(tornado.web.StaticFileHandler):
         self.set_header("Access-Control-Allow-Headers", "x-requested-with")
         self.set_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
 
-
+    def validate_absolute_path(self, root, absolute_path):
+        absolute_path = super().validate_absolute_path(root, absolute_path)
+        if absolute_path is None:
+            return None
+
+        accepted = self._accepted_encodings(self.request.headers.get('Accept-Encoding', ''))
+        for encoding, suffix in self.PRECOMPRESSED:
+            if os.path.isfile(absolute_path + suffix):
+                self.set_header('Vary', 'Accept-Encoding')
+                if encoding in accepted:
+                    self.content_encoding = encoding
+                    self.uncompressed_path = absolute_path
+                    self.set_header('Content-Encoding', encoding)
+                    # Revalidate so size and modified time describe the compressed file
+                    return super().validate_absolute_path(root, absolute_path + suffix)
+        return absolute_path
+
+    @staticmethod
+    def _accepted_encodings(accept_encoding):
+        accepted = set()
+        for value in accept_encoding.split(','):
+            coding, _, params = value.partition(';')
+            qvalue = 1.0
+            for param in params.split(';'):
+                name, _, param_value = param.partition('=')
+                if name.strip().lower() == 'q':
+                    try:
+                        qvalue = float(param_value)
+                    except ValueError:
+                        qvalue = 0.0
+            # q=0 means the client explicitly refuses this coding
+            if qvalue > 0:
+                accepted.add(coding.strip().lower())
+        return accepted
+
+    def get_content_type(self):
+        if self.content_encoding is None:
+            return super().get_content_type()
+        mime_type, _ = mimetypes.guess_type(self.uncompressed_path)
+        return mime_type or 'application/octet-stream'
+
+    def get_cache_time(self, path, modified, mime_type):
+        if self._is_hashed_asset():
+            return self.CACHE_MAX_AGE
+        return super().get_cache_time(path, modified, mime_type)
+
+    def set_extra_headers(self, path):
+        if self._is_hashed_asset():
+            self.set_header('Cache-Control', f'public, max-age={self.CACHE_MAX_AGE}, immutable')
+
+    def _is_hashed_asset(self):
+        # Vite emits content-hashed file names under assets/, so a URL there never changes content
+        return os.path.relpath(self.absolute_path, self.root).startswith('assets' + os.sep)
 
 
 class SPAStaticFileHandler(CORSStaticFileHandler):
@@ -207,6 +347,95 @@ def make_app(docs_dir, static_dir):
     return tornado.web.Application(handlers)
 
 
+def control_socket_path(port):
+    """Unix socket the server on `port` also accepts local control requests on.
+
+    The socket lives in a per-user directory: a fixed name in the shared temp
+    directory could be pre-bound by another user to intercept control requests.
+
+    Returns:
+        The socket path, or None if the platform has no Unix domain sockets
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if not runtime_dir:
+        runtime_dir = os.path.join(tempfile.gettempdir(), f'scriptbook-{os.getuid()}')
+    return os.path.join(runtime_dir, f'scriptbook-{port}.sock')
+
+
+def _is_private_dir(path):
+    """Whether `path` is a directory owned by the current user that no one else can write to."""
+    st = os.stat(path)
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+
+def is_trusted_control_socket(socket_path):
+    """Whether `socket_path` is a socket the current user created in a private directory."""
+    try:
+        if not _is_private_dir(os.path.dirname(socket_path)):
+            return False
+        st = os.stat(socket_path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def bind_control_socket(server, socket_path):
+    """Also serve `server` on the control Unix socket.
+
+    The socket is only a fast path for local `scriptbook control` calls, so
+    any failure is logged and the server keeps running over TCP.
+
+    Returns:
+        True if this process bound the socket (and must remove it on exit)
+    """
+    if socket_path is None:
+        return False
+
+    socket_dir = os.path.dirname(socket_path)
+    try:
+        os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+        private = _is_private_dir(socket_dir)
+    except OSError as e:
+        logger.warning(f"Cannot create control socket directory {socket_dir}, control commands will use TCP: {e}")
+        return False
+    if not private:
+        logger.warning(f"Control socket directory {socket_dir} is not private to this user, control commands will use TCP")
+        return False
+
+    # bind_unix_socket unlinks an existing socket file; don't steal a live one
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+        logger.warning(f"Control socket {socket_path} is used by another server, not binding it")
+        return False
+    except OSError:
+        pass
+    finally:
+        probe.close()
+
+    try:
+        server.add_socket(tornado.netutil.bind_unix_socket(socket_path))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Cannot bind control socket {socket_path}, control commands will use TCP: {e}")
+        return False
+    return True
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a Unix domain socket."""
+
+    def __init__(self, socket_path, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description='ScriptBook - Terminal WebSocket server')
@@ -256,31 +485,65 @@ def cmd_control(args):
         'payload': payload
     }
 
-    url = f"http://{args.host}:{args.port}/api/control"
-    try:
-        req = urllib.request.Request(
-            url,
-            data=json.dumps(data).encode('utf-8'),
-            headers={'Content-Type': 'application/json'}
-        )
-        with urllib.request.urlopen(req, timeout=5) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            if result.get('status') == 'ok':
-                print(f"Command '{args.action}' sent")
-            else:
-                print(f"Error: {result.get('error', 'Unknown')}", file=sys.stderr)
+    body = json.dumps(data).encode('utf-8')
+    headers = {'Content-Type': 'application/json'}
+
+    result = None
+    socket_path = control_socket_path(args.port)
+    if args.host in ('localhost', '127.0.0.1') and socket_path and is_trusted_control_socket(socket_path):
+        conn = UnixHTTPConnection(socket_path, timeout=CONTROL_TIMEOUT)
+        try:
+            conn.connect()
+        except (FileNotFoundError, ConnectionRefusedError, PermissionError) as e:
+            # Nothing was sent (e.g. stale socket left by a crashed server), so TCP is safe
+            logger.debug(f"Control socket {socket_path} unusable, using TCP: {e}")
+            conn.close()
+        except OSError as e:
+            print(f"Error: Cannot connect to {socket_path}: {e!r}", file=sys.stderr)
+            sys.exit(1)
+        else:
+            try:
+                conn.request('POST', '/api/control', body, headers)
+                result = json.loads(conn.getresponse().read().decode('utf-8'))
+            except (OSError, http.client.HTTPException, ValueError) as e:
+                # The server may already have run the command; resending over TCP could run it twice
+                print(f"Error: Control request via {socket_path} failed: {e!r}", file=sys.stderr)
                 sys.exit(1)
-    except urllib.error.HTTPError as e:
-        error = json.loads(e.read().decode('utf-8'))
-        print(f"Error: {error.get('error', e)}", file=sys.stderr)
-        sys.exit(1)
-    except urllib.error.URLError as e:
-        print(f"Error: Cannot connect to {url}: {e.reason}", file=sys.stderr)
+            finally:
+                conn.close()
+
+    url = f"http://{args.host}:{args.port}/api/control"
+    if result is None:
+        try:
+            req = urllib.request.Request(url, data=body, headers=headers)
+            with urllib.request.urlopen(req, timeout=CONTROL_TIMEOUT) as response:
+                result = json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            result = json.loads(e.read().decode('utf-8'))
+        except urllib.error.URLError as e:
+            print(f"Error: Cannot connect to {url}: {e.reason}", file=sys.stderr)
+            sys.exit(1)
+
+    if result.get('status') == 'ok':
+        print(f"Command '{args.action}' sent")
+    else:
+        print(f"Error: {result.get('error', 'Unknown')}", file=sys.stderr)
         sys.exit(1)
 
 
 def cmd_server(args):
     """Start the ScriptBook server."""
+    # uvloop is an optional extra (no Windows support); without it the stock asyncio loop is used.
+    # The loop is set directly rather than through an event loop policy, which Python 3.14
+    # deprecates, and must exist before anything creates the IOLoop (autoreload included).
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        asyncio.set_event_loop(uvloop.new_event_loop())
+        logger.info("Using uvloop event loop")
+
     # Enable autoreload in development mode
     if os.environ.get('DEV_MODE', 'false').lower() == 'true':
         import tornado.autoreload as tornado_autoreload
@@ -308,13 +571,32 @@ def cmd_server(args):
         raise NotADirectoryError(f"Static path is not a directory: {static_dir}")
 
     app = make_app(content, static_dir)
-    app.listen(args.port, args.host)
+    server = tornado.httpserver.HTTPServer(app)
+    sockets = tornado.netutil.bind_sockets(args.port, address=args.host)
+    # Terminal output is many small frames; Nagle would hold them back ~40ms.
+    # Accepted connections inherit the option from the listening socket.
+    for sock in sockets:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    server.add_sockets(sockets)
+
+    # Local `scriptbook control` calls skip the TCP stack through this socket
+    socket_path = control_socket_path(args.port)
+    control_socket_bound = bind_control_socket(server, socket_path)
 
     logger.info(f"ScriptBook server started on {args.host}:{args.port}")
     logger.info(f"Document directory: {content}")
     logger.info(f"Frontend: http://{args.host}:{args.port}/")
+    if control_socket_bound:
+        logger.info(f"Control socket: {socket_path}")
 
-    tornado.ioloop.IOLoop.current().start()
+    try:
+        tornado.ioloop.IOLoop.current().start()
+    finally:
+        if control_socket_bound:
+            try:
+                os.remove(socket_path)
+            except FileNotFoundError:
+                pass
 
 
 def main():
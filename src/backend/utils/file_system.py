@@ -9,6 +9,8 @@ from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
+LISTED_SUFFIXES = ('.tl', '.md', '.layout.json')
+
 
 def is_safe_path(base_dir: str, requested_path: str) -> bool:
     """
@@ -24,12 +26,16 @@ def is_safe_path(base_dir: str, requested_path: str) -> bool:
     Raises:
         RuntimeError: If path resolution fails unexpectedly
     """
-    # Resolve both paths to absolute paths
     base_abs = os.path.abspath(base_dir)
-    requested_abs = os.path.abspath(os.path.join(base_dir, requested_path))
+    # Joining onto the absolute base leaves only a normpath, no second getcwd
+    requested_abs = os.path.abspath(os.path.join(base_abs, requested_path))
 
-    # Check if the resolved path starts with the base directory
-    return requested_abs.startswith(base_abs)
+    # A plain prefix check would accept siblings such as /docs-private for /docs
+    try:
+        return os.path.commonpath([base_abs, requested_abs]) == base_abs
+    except ValueError:
+        # Paths on different drives (Windows)
+        return False
 
 
 def list_markdown_files(directory: str) -> List[str]:
@@ -55,12 +61,11 @@ def list_markdown_files(directory: str) -> List[str]:
 
     files = []
     try:
-        for item in os.listdir(directory):
-            item_path = os.path.join(directory, item)
-            if os.path.isfile(item_path):
-                item_lower = item.lower()
-                if item_lower.endswith('.tl') or item_lower.endswith('.md') or item_lower.endswith('.layout.json'):
-                    files.append(item)
+        # scandir exposes d_type, so is_file() usually needs no extra stat per entry
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(LISTED_SUFFIXES):
+                    files.append(entry.name)
     except PermissionError as e:
         logger.error(f"Permission denied accessing directory {directory}: {e}")
         raise
@@ -115,16 +120,25 @@ def read_file_content(base_dir: str, filename: str, max_size: int = 1024 * 1024)
     if file_size > max_size:
         raise IOError(f"File too large: {file_size} bytes (max: {max_size} bytes)")
 
+    # One bytes read and one decode instead of the text layer's incremental decoder
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    except UnicodeDecodeError as e:
-        logger.error(f"File {filename} is not UTF-8 encoded: {e}")
-        raise IOError(f"File {filename} must be UTF-8 encoded")
+        with open(file_path, 'rb') as f:
+            data = f.read()
     except Exception as e:
         logger.error(f"Error reading file {filename}: {e}")
         raise IOError(f"Cannot read file {filename}: {e}")
 
+    try:
+        content = data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        logger.error(f"File {filename} is not UTF-8 encoded: {e}")
+        raise IOError(f"File {filename} must be UTF-8 encoded")
+
+    # Keep the universal-newline translation text mode used to apply
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
 
 def write_file_content(base_dir: str, filename: str, content: str) -> None:
     """
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Test the control command Unix socket fast path using pytest.
+"""
+import argparse
+import json
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler
+import pytest
+import tornado.httpserver
+import tornado.web
+
+import backend.main
+from backend.main import bind_control_socket, cmd_control, control_socket_path
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="requires Unix domain sockets")
+
+
+def _make_server():
+    return tornado.httpserver.HTTPServer(tornado.web.Application([]))
+
+
+def test_bind_control_socket():
+    """Test binding the control socket and leaving a live one alone."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        socket_path = os.path.join(tmpdir, "control.sock")
+
+        server = _make_server()
+        try:
+            assert bind_control_socket(server, socket_path) == True
+            assert os.path.exists(socket_path)
+
+            # A second server must not unlink the live socket of the first
+            other = _make_server()
+            assert bind_control_socket(other, socket_path) == False
+            other.stop()
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            probe.connect(socket_path)
+            probe.close()
+        finally:
+            server.stop()
+
+
+def test_bind_control_socket_failure_is_not_fatal():
+    """Test a path that cannot be bound only disables the fast path."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        socket_path = os.path.join(tmpdir, "control.sock")
+        with open(socket_path, "w") as f:
+            f.write("not a socket")
+
+        server = _make_server()
+        try:
+            assert bind_control_socket(server, socket_path) == False
+        finally:
+            server.stop()
+
+        # The regular file is left untouched
+        with open(socket_path) as f:
+            assert f.read() == "not a socket"
+
+        # The socket directory cannot be created below a regular file
+        server = _make_server()
+        try:
+            assert bind_control_socket(server, os.path.join(socket_path, "control.sock")) == False
+        finally:
+            server.stop()
+
+
+def test_control_socket_path(monkeypatch):
+    """Test the control socket lives in a per-user directory."""
+    monkeypatch.setenv('XDG_RUNTIME_DIR', '/run/user/1000')
+    assert control_socket_path(8080) == '/run/user/1000/scriptbook-8080.sock'
+
+    monkeypatch.delenv('XDG_RUNTIME_DIR')
+    assert control_socket_path(8080) == os.path.join(
+        tempfile.gettempdir(), f'scriptbook-{os.getuid()}', 'scriptbook-8080.sock')
+
+
+def test_bind_control_socket_private_dir():
+    """Test the socket directory is created private and a shared one is refused."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        socket_dir = os.path.join(tmpdir, "runtime")
+        server = _make_server()
+        try:
+            assert bind_control_socket(server, os.path.join(socket_dir, "control.sock")) == True
+        finally:
+            server.stop()
+        assert stat.S_IMODE(os.stat(socket_dir).st_mode) & 0o077 == 0
+
+        shared_dir = os.path.join(tmpdir, "shared")
+        os.mkdir(shared_dir)
+        os.chmod(shared_dir, 0o777)
+        server = _make_server()
+        try:
+            assert bind_control_socket(server, os.path.join(shared_dir, "control.sock")) == False
+        finally:
+            server.stop()
+        assert os.listdir(shared_dir) == []
+
+
+def _control_args():
+    return argparse.Namespace(connection_id='conn-1', action='focus_window', filename=None, type=None,
+                              direction=None, window_id='w1', host='localhost', port=8080)
+
+
+class _FakeResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def read(self):
+        return self.body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _ControlRequestHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        self.server.received.append((self.path, json.loads(self.rfile.read(length))))
+        body = b'{"status": "ok"}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _fake_tcp(monkeypatch):
+    requests = []
+
+    def fake_urlopen(req, timeout=None):
+        requests.append(req)
+        return _FakeResponse(b'{"status": "ok"}')
+    monkeypatch.setattr(backend.main.urllib.request, 'urlopen', fake_urlopen)
+    return requests
+
+
+def _serve_control(socket_path):
+    server = socketserver.UnixStreamServer(socket_path, _ControlRequestHandler)
+    server.received = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_cmd_control_uses_unix_socket(monkeypatch, capsys):
+    """Test control commands go over a live control socket, not TCP."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        socket_path = os.path.join(tmpdir, "control.sock")
+        monkeypatch.setattr(backend.main, 'control_socket_path', lambda port: socket_path)
+
+        def fail_urlopen(*args, **kwargs):
+            raise AssertionError("TCP must not be used")
+        monkeypatch.setattr(backend.main.urllib.request, 'urlopen', fail_urlopen)
+
+        server = _serve_control(socket_path)
+        try:
+            cmd_control(_control_args())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert server.received == [('/api/control', {
+            'connection_id': 'conn-1',
+            'action': 'focus_window',
+            'payload': {'windowId': 'w1'},
+        })]
+        assert "Command 'focus_window' sent" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("foreign", ['socket', 'directory'])
+def test_cmd_control_skips_untrusted_socket(monkeypatch, capsys, foreign):
+    """Test a socket another user owns, or one in a shared directory, is not used."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        socket_path = os.path.join(tmpdir, "control.sock")
+        monkeypatch.setattr(backend.main, 'control_socket_path', lambda port: socket_path)
+        requests = _fake_tcp(monkeypatch)
+
+        server = _serve_control(socket_path)
+        try:
+            if foreign == 'socket':
+                real_stat = os.stat
+
+                def stat_as_other_user(path, *args, **kwargs):
+                    st = real_stat(path, *args, **kwargs)
+                    if path == socket_path:
+                        return os.stat_result((st.st_mode, st.st_ino, st.st_dev, st.st_nlink, st.st_uid + 1, *st[5:]))
+                    return st
+                monkeypatch.setattr(backend.main.os, 'stat', stat_as_other_user)
+            else:
+                os.chmod(tmpdir, 0o777)
+            cmd_control(_control_args())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert server.received == []
+        assert [req.full_url for req in requests] == ['http://localhost:8080/api/control']
+        assert "Command 'focus_window' sent" in capsys.readouterr().out
+
+
+def test_cmd_control_stale_socket_falls_back_to_tcp(monkeypatch, capsys):
+    """Test a socket file nobody listens on falls back to TCP."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        socket_path = os.path.join(tmpdir, "control.sock")
+        # Bound but never listening: what a crashed server leaves behind
+        dead = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        dead.bind(socket_path)
+        dead.close()
+        monkeypatch.setattr(backend.main, 'control_socket_path', lambda port: socket_path)
+        requests = _fake_tcp(monkeypatch)
+
+        cmd_control(_control_args())
+
+        assert [req.full_url for req in requests] == ['http://localhost:8080/api/control']
+        assert "Command 'focus_window' sent" in capsys.readouterr().out
+
+
+class _SentOnlyControlServer:
+    """Unix server that reads one request and then hangs up, stalls, or answers garbage."""
+
+    def __init__(self, socket_path, mode):
+        self.mode = mode
+        self.received = []
+        self.done = threading.Event()
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(socket_path)
+        self.sock.listen(1)
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        conn, _ = self.sock.accept()
+        with conn:
+            self.received.append(conn.recv(65536))
+            if self.mode == 'stall':
+                # Acted on the request but replies only after the client gave up
+                self.done.wait(5)
+            elif self.mode == 'not_json':
+                conn.sendall(b'HTTP/1.1 200 OK\r\nContent-Length: 6\r\n\r\nnot ok')
+            elif self.mode == 'truncated':
+                conn.sendall(b'HTTP/1.1 200 OK\r\nContent-Length: 100\r\n\r\n{"status"')
+
+    def close(self):
+        self.done.set()
+        self.thread.join(5)
+        self.sock.close()
+
+
+@pytest.mark.parametrize("mode", ['hang_up', 'stall', 'not_json', 'truncated'])
+def test_cmd_control_sent_request_is_not_resent(monkeypatch, capsys, mode):
+    """Test a request already sent over the socket is reported, never repeated over TCP."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        socket_path = os.path.join(tmpdir, "control.sock")
+        monkeypatch.setattr(backend.main, 'control_socket_path', lambda port: socket_path)
+        monkeypatch.setattr(backend.main, 'CONTROL_TIMEOUT', 0.2)
+
+        def fail_urlopen(*args, **kwargs):
+            raise AssertionError("TCP must not be used")
+        monkeypatch.setattr(backend.main.urllib.request, 'urlopen', fail_urlopen)
+
+        server = _SentOnlyControlServer(socket_path, mode)
+        try:
+            with pytest.raises(SystemExit) as exc_info:
+                cmd_control(_control_args())
+        finally:
+            server.close()
+
+        assert exc_info.value.code == 1
+        assert len(server.received) == 1 and server.received[0].startswith(b'POST /api/control')
+        assert "Error: Control request via" in capsys.readouterr().err
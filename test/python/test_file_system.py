@@ -18,6 +18,8 @@ def test_is_safe_path():
     assert is_safe_path(base, "subdir/file.md") == True
     assert is_safe_path(base, "../file.md") == False  # Outside base
     assert is_safe_path(base, "/etc/passwd") == False  # Absolute path outside
+    assert is_safe_path(base, "../test2/file.md") == False  # Sibling sharing the prefix
+    assert is_safe_path(base, "") == True
 
 
 def test_list_markdown_files():
@@ -29,17 +31,20 @@ def test_list_markdown_files():
         open(os.path.join(tmpdir, "test3.txt"), "w").close()  # Should be ignored
         os.mkdir(os.path.join(tmpdir, "subdir"))  # Directory should be ignored
 
+        open(os.path.join(tmpdir, "README.MD"), "w").close()
+        os.symlink(os.path.join(tmpdir, "test1.tl"), os.path.join(tmpdir, "link.tl"))
+
         files = list_markdown_files(tmpdir)
-        assert set(files) == {"test1.tl", "test2.tl"}
+        assert set(files) == {"README.MD", "builtin.tl", "link.tl", "test1.tl", "test2.tl"}
         assert "test3.txt" not in files
 
         # Should be sorted
-        assert files == ["test1.tl", "test2.tl"]
+        assert files == ["README.MD", "builtin.tl", "link.tl", "test1.tl", "test2.tl"]
 
-        # Test empty directory
+        # Test empty directory: only the virtual builtin.tl
         empty_dir = os.path.join(tmpdir, "empty")
         os.mkdir(empty_dir)
-        assert list_markdown_files(empty_dir) == []
+        assert list_markdown_files(empty_dir) == ["builtin.tl"]
 
 
 def test_read_file_content():
@@ -73,6 +78,17 @@ def test_read_file_content_encoding():
         read_content = read_file_content(tmpdir, "test.tl")
         assert read_content == content
 
+        # Non UTF-8 content is rejected
+        with open(test_file, "wb") as f:
+            f.write("中文".encode("gbk"))
+        with pytest.raises(IOError, match="must be UTF-8 encoded"):
+            read_file_content(tmpdir, "test.tl")
+
+        # Line endings are normalized like text mode reads
+        with open(test_file, "wb") as f:
+            f.write(b"a\r\nb\rc\n")
+        assert read_file_content(tmpdir, "test.tl") == "a\nb\nc\n"
+
 
 def test_read_file_content_size_limit():
     """Test file size limit enforcement."""
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test static file serving (pre-compressed assets, caching, SPA fallback) using pytest.
+"""
+import os
+import tempfile
+import tornado.testing
+
+from backend.main import make_app
+
+
+class StaticFileTest(tornado.testing.AsyncHTTPTestCase):
+
+    def get_app(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        static_dir = self.tmpdir.name
+        files = {
+            'index.html': b'<html></html>',
+            'app.js': b'plain',
+            'app.js.br': b'brotli',
+            'app.js.gz': b'gzipped',
+            'style.css': b'body {}',
+            'assets/index-abc123.js': b'hashed',
+            'assets/index-abc123.js.gz': b'hashed gzipped',
+        }
+        for name, content in files.items():
+            path = os.path.join(static_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(content)
+        return make_app(static_dir, static_dir)
+
+    def tearDown(self):
+        super().tearDown()
+        self.tmpdir.cleanup()
+
+    def fetch_encoded(self, path, accept_encoding=None):
+        # decompress_response=False keeps the client from sending its own Accept-Encoding
+        headers = {'Accept-Encoding': accept_encoding} if accept_encoding is not None else {}
+        return self.fetch(path, headers=headers, decompress_response=False)
+
+    def test_prefers_brotli(self):
+        response = self.fetch_encoded('/app.js', 'gzip, deflate, br')
+        assert response.code == 200
+        assert response.body == b'brotli'
+        assert response.headers['Content-Encoding'] == 'br'
+        assert response.headers['Content-Length'] == str(len(b'brotli'))
+        assert response.headers['Vary'] == 'Accept-Encoding'
+        # Content-Type comes from app.js, not app.js.br
+        assert 'javascript' in response.headers['Content-Type']
+
+    def test_falls_back_to_gzip(self):
+        response = self.fetch_encoded('/app.js', 'gzip')
+        assert response.body == b'gzipped'
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'javascript' in response.headers['Content-Type']
+
+    def test_no_accept_encoding(self):
+        response = self.fetch_encoded('/app.js')
+        assert response.body == b'plain'
+        assert 'Content-Encoding' not in response.headers
+        assert response.headers['Vary'] == 'Accept-Encoding'
+
+    def test_q_zero_refuses_encoding(self):
+        response = self.fetch_encoded('/app.js', 'br;q=0, gzip;q=0.5')
+        assert response.body == b'gzipped'
+        assert response.headers['Content-Encoding'] == 'gzip'
+
+        response = self.fetch_encoded('/app.js', 'br; q=0, gzip;Q=0.000')
+        assert response.body == b'plain'
+        assert 'Content-Encoding' not in response.headers
+
+    def test_no_precompressed_sibling(self):
+        response = self.fetch_encoded('/style.css', 'gzip, br')
+        assert response.body == b'body {}'
+        assert 'Content-Encoding' not in response.headers
+        assert 'Vary' not in response.headers
+
+    def test_hashed_assets_are_immutable(self):
+        response = self.fetch_encoded('/assets/index-abc123.js', 'gzip')
+        assert response.body == b'hashed gzipped'
+        assert 'immutable' in response.headers['Cache-Control']
+
+        response = self.fetch_encoded('/assets/index-abc123.js')
+        assert response.body == b'hashed'
+        assert 'immutable' in response.headers['Cache-Control']
+
+        response = self.fetch_encoded('/app.js')
+        assert 'immutable' not in response.headers.get('Cache-Control', '')
+
+    def test_spa_fallback_is_not_immutable(self):
+        for path in ('/some/client/route', '/assets/missing-def456.js'):
+            response = self.fetch_encoded(path)
+            assert response.code == 200
+            assert response.body == b'<html></html>'
+            assert 'immutable' not in response.headers.get('Cache-Control', '')
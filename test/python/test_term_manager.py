@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test SandboxTermManager config handling using pytest.
+"""
+import os
+import tempfile
+import pytest
+
+from backend.main import SandboxTermManager
+
+
+def test_read_shell_command():
+    """Test parsing shell_command from .tl config files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = SandboxTermManager(shell_command=['bash'], docs_dir=tmpdir)
+        config_path = os.path.join(tmpdir, "test.tl")
+
+        with open(config_path, "w") as f:
+            f.write("# shell_command=ignored\nname = test\n  shell_command = \"ssh host\"\nshell_command=other\n")
+        assert manager._read_shell_command(config_path, "test.tl") == "ssh host"
+
+        # Missing or empty shell_command falls back to bash
+        with open(config_path, "w") as f:
+            f.write("name = test\n")
+        os.utime(config_path, ns=(0, 1))
+        assert manager._read_shell_command(config_path, "test.tl") == "bash"
+
+        with pytest.raises(FileNotFoundError):
+            manager._read_shell_command(os.path.join(tmpdir, "missing.tl"), "missing.tl")
+
+
+def test_read_shell_command_cache():
+    """Test config is reparsed only when its mtime, size or inode changes."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = SandboxTermManager(shell_command=['bash'], docs_dir=tmpdir)
+        config_path = os.path.join(tmpdir, "test.tl")
+
+        with open(config_path, "w") as f:
+            f.write("shell_command=one\n")
+        os.utime(config_path, ns=(0, 1))
+        assert manager._read_shell_command(config_path, "test.tl") == "one"
+
+        # Same mtime and size: cached value is returned
+        with open(config_path, "w") as f:
+            f.write("shell_command=two\n")
+        os.utime(config_path, ns=(0, 1))
+        assert manager._read_shell_command(config_path, "test.tl") == "one"
+
+        os.utime(config_path, ns=(0, 2))
+        assert manager._read_shell_command(config_path, "test.tl") == "two"
+
+        # Same mtime but a different size, as after two edits within a coarse timestamp tick
+        with open(config_path, "w") as f:
+            f.write("shell_command=three\n")
+        os.utime(config_path, ns=(0, 2))
+        assert manager._read_shell_command(config_path, "test.tl") == "three"
+
+        # Same mtime and size but replaced by a new file (editors that save via rename)
+        replacement = os.path.join(tmpdir, "test.tl.new")
+        with open(replacement, "w") as f:
+            f.write("shell_command=seven\n")
+        os.utime(replacement, ns=(0, 2))
+        os.replace(replacement, config_path)
+        assert manager._read_shell_command(config_path, "test.tl") == "seven"
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test TerminalWebSocketHandler output coalescing using pytest.
+"""
+import asyncio
+import json
+import tempfile
+from unittest import mock
+import tornado.testing
+import tornado.websocket
+
+from backend.main import TerminalWebSocketHandler, make_app
+
+
+class TerminalSocketTest(tornado.testing.AsyncHTTPTestCase):
+
+    def setUp(self):
+        # Keep the server-side handlers so the test can feed PTY output directly
+        self.handlers = []
+        original_open = TerminalWebSocketHandler.open
+
+        def open(handler, *args, **kwargs):
+            self.handlers.append(handler)
+            return original_open(handler, *args, **kwargs)
+
+        patcher = mock.patch.object(TerminalWebSocketHandler, 'open', open)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+    def get_app(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        return make_app(self.tmpdir.name, self.tmpdir.name)
+
+    def tearDown(self):
+        if self.handlers:
+            self.io_loop.run_sync(self.handlers[0].term_manager.shutdown)
+        super().tearDown()
+        self.tmpdir.cleanup()
+
+    async def connect(self):
+        url = f"ws://127.0.0.1:{self.get_http_port()}/ws/builtin.tl/t1"
+        conn = await tornado.websocket.websocket_connect(url)
+        assert json.loads(await conn.read_message()) == ["setup", {}]
+        return conn, self.handlers[-1]
+
+    async def read_until(self, conn, predicate, timeout=5):
+        """Read frames until one satisfies predicate; return all frames read."""
+        frames = []
+        while True:
+            message = await asyncio.wait_for(conn.read_message(), timeout)
+            assert message is not None, f"connection closed after {frames}"
+            frames.append(json.loads(message))
+            if predicate(frames[-1]):
+                return frames
+
+    @tornado.testing.gen_test
+    async def test_large_output_flushes_immediately(self):
+        # With a timer this long, only the size threshold can deliver output in time
+        with mock.patch.object(TerminalWebSocketHandler, 'FLUSH_DELAY', 60):
+            conn, handler = await self.connect()
+            text = 'x' * TerminalWebSocketHandler.FLUSH_SIZE
+            handler.on_pty_read(text)
+            assert handler._pending_output == []
+            frames = await self.read_until(conn, lambda frame: text in frame[1])
+            assert frames[-1][0] == "stdout"
+            conn.close()
+
+    @tornado.testing.gen_test
+    async def test_small_reads_flush_after_delay(self):
+        conn, handler = await self.connect()
+        handler.on_pty_read('<first')
+        handler.on_pty_read(' second>')
+        # Nothing is written until the timer fires, then both reads share a frame
+        assert handler._flush_timeout is not None
+        frames = await self.read_until(conn, lambda frame: '<first second>' in frame[1])
+        assert handler._flush_timeout is None
+        conn.close()
+
+    @tornado.testing.gen_test
+    async def test_pending_output_flushed_before_disconnect(self):
+        with mock.patch.object(TerminalWebSocketHandler, 'FLUSH_DELAY', 60):
+            conn, handler = await self.connect()
+            handler.on_pty_read('<last words>')
+            await conn.write_message(json.dumps(["stdin", "exit\r"]))
+            frames = await self.read_until(conn, lambda frame: frame == ["disconnect", 1])
+            stdout = ''.join(frame[1] for frame in frames if frame[0] == "stdout")
+            assert '<last words>' in stdout
+            assert await conn.read_message() is None
+
+    @tornado.testing.gen_test
+    async def test_no_write_after_close(self):
+        conn, handler = await self.connect()
+        with mock.patch.object(handler, 'write_message') as write_message:
+            handler.on_pty_read('<never sent>')
+            conn.close()
+            for _ in range(100):
+                if handler.ws_connection is None:
+                    break
+                await asyncio.sleep(0.01)
+            assert handler._flush_timeout is None
+            assert handler._pending_output == []
+            await asyncio.sleep(TerminalWebSocketHandler.FLUSH_DELAY * 10)
+            handler.on_pty_read('<after close>')
+            await asyncio.sleep(TerminalWebSocketHandler.FLUSH_DELAY * 10)
+        write_message.assert_not_called()
@@ -1,10 +1,32 @@
 import { defineConfig } from 'vite'
 import vue from '@vitejs/plugin-vue'
+import { readFileSync, writeFileSync } from 'node:fs'
+import { join } from 'node:path'
+import { brotliCompressSync, gzipSync } from 'node:zlib'
+
+// Write .br/.gz siblings next to text assets; the backend serves them
+// when the browser accepts the encoding instead of sending raw bundles
+function precompress({ minSize = 1024 } = {}) {
+  return {
+    name: 'scriptbook-precompress',
+    apply: 'build',
+    writeBundle(options, bundle) {
+      for (const fileName of Object.keys(bundle)) {
+        if (!/\.(js|css|html|svg|json)$/.test(fileName)) continue
+        const filePath = join(options.dir, fileName)
+        const content = readFileSync(filePath)
+        if (content.length < minSize) continue
+        writeFileSync(`${filePath}.br`, brotliCompressSync(content))
+        writeFileSync(`${filePath}.gz`, gzipSync(content, { level: 9 }))
+      }
+    },
+  }
+}
 
 // https://vite.dev/config/
 export default defineConfig({
   root: 'src/frontend',
-  plugins: [vue()],
+  plugins: [vue(), precompress()],
   server: {
     port: 7771,
   },